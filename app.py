@@ -1,11 +1,30 @@
 from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import select
 from flask_cors import CORS
+from flask_compress import Compress
 from flask_restx import Api, Resource, fields
 from datetime import datetime
-from openai import OpenAI
+from openai import (
+    AsyncOpenAI, APIConnectionError, APIStatusError, DefaultAioHttpClient, NotFoundError
+)
+from collections import OrderedDict, deque
+from httpx_aiohttp import AiohttpTransport
+import aiohttp
+import httpx
+import redis.asyncio as redis
+import tiktoken
+import asyncio
+import os
+import hashlib
+from functools import lru_cache
+import string
+import random
+import threading
+import time
 import logging
-import json
+import orjson
+from flask.json.provider import JSONProvider
 from secrets_manager import get_service_secrets
 
 # Configure logging
@@ -13,9 +32,36 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(levelname)s - %(message)s',
                    datefmt='%Y-%m-%d %H:%M:%S')
 
+# orjson serializes datetime/date natively; naive DB timestamps are UTC and rendered with a Z suffix
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=ORJSON_OPTIONS), mimetype='application/json'
+        )
+
 app = Flask(__name__)
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON responses over COMPRESS_MIN_SIZE (500 bytes), preferring zstd then brotli
+app.config['COMPRESS_ALGORITHM'] = ['zstd', 'br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 3
+app.config['COMPRESS_BR_LEVEL'] = 3
+app.config['COMPRESS_ZSTD_LEVEL'] = 3
+Compress(app)
+
 # Configure API
 api = Api(app,
     version='1.0',
@@ -24,14 +70,25 @@ api = Api(app,
     doc='/docs'
 )
 
+@api.representation('application/json')
+def output_json(data, code, headers=None):
+    """Serialize flask_restx responses with orjson"""
+    response = app.response_class(
+        orjson.dumps(data, option=ORJSON_OPTIONS), status=code, mimetype='application/json'
+    )
+    response.headers.extend(headers or {})
+    return response
+
 # Configure namespace
 ns = api.namespace('api', description='Metadata operations')
 
-secrets = get_service_secrets('gnosis-metadata')
+@lru_cache(maxsize=1)
+def _secrets():
+    """Service secrets, fetched once per process (once in total under gunicorn --preload)"""
+    return get_service_secrets('gnosis-metadata')
 
-API_KEY = secrets.get('API_KEY')
-
-C_PORT = int(secrets.get('PORT', 5000))
+# Flask-SQLAlchemy needs the database URL when it is initialized below
+secrets = _secrets()
 SQLALCHEMY_DATABASE_URI = (
     f"mysql+pymysql://{secrets['MYSQL_USER']}:{secrets['MYSQL_PASSWORD_CONTENT']}"
     f"@{secrets['MYSQL_HOST']}:{secrets['MYSQL_PORT']}/{secrets['MYSQL_DATABASE']}"
@@ -39,10 +96,202 @@ SQLALCHEMY_DATABASE_URI = (
 app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-OPENAI_API_KEY = secrets.get('OPENAI_API_KEY')
+OPENAI_MODEL = "gpt-4o-mini"
+OPENAI_MAX_RETRIES = 5
+# OPENAI_MAX_TOKENS_PER_MINUTE (secret) is the account-wide budget. Each gunicorn worker
+# throttles on its own window, so it gets an equal share based on WEB_CONCURRENCY,
+# the worker count gunicorn itself reads.
+WORKER_COUNT = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)
+# Status codes retried by create_chat_completion, matching the SDK's own retry policy
+OPENAI_RETRY_STATUS_CODES = (408, 409, 429)
+BATCH_MAX_CONCURRENCY = 10
+BATCH_MAX_ITEMS = 100
+# OpenAI Batch API statuses that can still change; every other status is terminal
+BATCH_PENDING_STATUSES = ('validating', 'in_progress', 'finalizing', 'cancelling')
+# Document text sent to the model is truncated to this many tokens
+PROMPT_TEXT_TOKENS = 1024
+# Documents marshaled into one prompt by extract_metadata_batch; returns diminish past ~8-16
+BATCH_DOCUMENTS_PER_PROMPT = 8
+
+# Per-process cache of content metadata reads. Entries expire after CONTENT_CACHE_TTL
+# seconds because other services also write to the content table.
+CONTENT_CACHE_SIZE = 4096
+CONTENT_CACHE_TTL = 60
+# Cache-Control max-age for content metadata responses, in seconds
+CONTENT_CACHE_MAX_AGE = 300
+
+# Extraction results are cached by prompt hash; Redis is shared across workers,
+# otherwise each process keeps its own LRU
+METADATA_CACHE_TTL = 30 * 24 * 60 * 60
+METADATA_CACHE_SIZE = 4096
+
+# Fraction of requests logged by log_request_info
+REQUEST_LOG_SAMPLE_RATE = 0.01
+
+# The OpenAI client and everything it touches are created lazily, per process, so
+# nothing bound to a thread or socket is inherited across gunicorn's fork.
+# A single AsyncOpenAI (and its aiohttp session) lives on a dedicated event loop
+# thread; Flask request threads submit coroutines to it, so in-flight OpenAI calls
+# are multiplexed instead of each pinning a worker thread.
+_openai_loop_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _openai_loop():
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='openai-loop', daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the OpenAI event loop and wait for its result"""
+    with _openai_loop_lock:
+        loop = _openai_loop()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def create_openai_session():
+    """aiohttp session with a keep-alive pool sized for concurrent OpenAI calls"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=100, keepalive_timeout=75)
+    )
+
+@lru_cache(maxsize=1)
+def _client():
+    # Retries are handled by create_chat_completion so they share the token throttle.
+    # The session is created lazily by the transport, on the OpenAI event loop.
+    return AsyncOpenAI(
+        api_key=_secrets().get('OPENAI_API_KEY'),
+        http_client=DefaultAioHttpClient(
+            transport=AiohttpTransport(client=create_openai_session),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        ),
+        max_retries=0
+    )
+
+class TokenRateLimiter:
+    """Rolling one-minute window over estimated OpenAI token usage.
+
+    Only used from the OpenAI event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_tokens_per_minute):
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.window = deque()
+        self.tokens_in_window = 0
+
+    async def acquire(self, tokens):
+        while True:
+            now = time.monotonic()
+            while self.window and now - self.window[0][0] >= 60:
+                self.tokens_in_window -= self.window.popleft()[1]
+
+            # An oversized request is let through on an empty window rather than blocking forever
+            if not self.window or self.tokens_in_window + tokens <= self.max_tokens_per_minute:
+                self.window.append((now, tokens))
+                self.tokens_in_window += tokens
+                return
+
+            await asyncio.sleep(60 - (now - self.window[0][0]))
+
+@lru_cache(maxsize=1)
+def _token_limiter():
+    max_tokens_per_minute = int(_secrets().get('OPENAI_MAX_TOKENS_PER_MINUTE', 200000))
+    return TokenRateLimiter(max_tokens_per_minute // WORKER_COUNT)
+
+def load_encoding():
+    """Load the model's tiktoken encoding, or None if it isn't available"""
+    try:
+        return tiktoken.encoding_for_model(OPENAI_MODEL)
+    except Exception as e:
+        # The encoding is baked into the image; this only happens if that cache is missing
+        logging.warning(f"tiktoken encoding unavailable, truncating by characters: {str(e)}")
+        return None
+
+# Loaded once at import (in the gunicorn master under --preload) rather than on the
+# OpenAI event loop, where a cache miss would block on a download; a failure is kept too
+encoding = load_encoding()
+
+def truncate_text(text):
+    """Trim text to its first PROMPT_TEXT_TOKENS tokens"""
+    if encoding is None:
+        return text[:PROMPT_TEXT_TOKENS * 4]
+
+    # Tokens average ~4 characters, so this slice leaves ample headroom without encoding huge inputs
+    tokens = encoding.encode(text[:PROMPT_TEXT_TOKENS * 8], disallowed_special=())
+    return encoding.decode(tokens[:PROMPT_TEXT_TOKENS])
+
+@lru_cache(maxsize=1)
+def _redis():
+    redis_url = _secrets().get('REDIS_URL')
+    return redis.Redis.from_url(redis_url) if redis_url else None
+
+local_metadata_cache = OrderedDict()
+
+def metadata_cache_key(messages):
+    """Content-addressed cache key for an extraction prompt"""
+    prompt_bytes = orjson.dumps([OPENAI_MODEL, messages])
+    return 'metadata:' + hashlib.blake2b(prompt_bytes, digest_size=16).hexdigest()
+
+async def get_cached_metadata(key):
+    try:
+        redis_client = _redis()
+        if redis_client:
+            cached = await redis_client.get(key)
+        else:
+            cached = local_metadata_cache.get(key)
+            if cached is not None:
+                local_metadata_cache.move_to_end(key)
+        return orjson.loads(cached) if cached is not None else None
+    except Exception as e:
+        logging.warning(f"Metadata cache read failed: {str(e)}")
+        return None
+
+async def set_cached_metadata(key, metadata):
+    try:
+        redis_client = _redis()
+        if redis_client:
+            await redis_client.setex(key, METADATA_CACHE_TTL, orjson.dumps(metadata))
+        else:
+            local_metadata_cache[key] = orjson.dumps(metadata)
+            if len(local_metadata_cache) > METADATA_CACHE_SIZE:
+                local_metadata_cache.popitem(last=False)
+    except Exception as e:
+        logging.warning(f"Metadata cache write failed: {str(e)}")
+
+def estimate_tokens(messages):
+    """Rough prompt token estimate (~4 characters per token) plus room for the reply"""
+    return sum(len(message['content']) for message in messages) // 4 + 300
+
+def retry_after_seconds(error):
+    """Seconds requested by a Retry-After header, if the response has a numeric one"""
+    try:
+        return float(error.response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+async def create_chat_completion(messages, **kwargs):
+    """Create a chat completion, retrying connection errors, timeouts and 408/409/429/5xx
+    responses with exponential backoff (or the server's Retry-After, when given)"""
+    await _token_limiter().acquire(estimate_tokens(messages))
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        try:
+            return await _client().chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                **kwargs
+            )
+        except (APIConnectionError, APIStatusError) as e:
+            # APITimeoutError is a subclass of APIConnectionError
+            retryable = isinstance(e, APIConnectionError) or (
+                e.status_code in OPENAI_RETRY_STATUS_CODES or e.status_code >= 500
+            )
+            if attempt == OPENAI_MAX_RETRIES or not retryable:
+                raise
+
+            delay = retry_after_seconds(e) if isinstance(e, APIStatusError) else None
+            if delay is None:
+                delay = min(2 ** attempt, 30) + random.random()
+            logging.warning(f"OpenAI request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
 
 db = SQLAlchemy(app)
 
@@ -66,19 +315,89 @@ class Content(db.Model):
     genre = db.Column(db.String(100))
     topic = db.Column(db.Text)
 
-def extract_metadata_from_text(text, file_name, additional_info=None):
-    """Extract metadata using OpenAI API"""
-    context = f"Additional context: {additional_info}\n\n" if additional_info else ""
-    
-    prompt = f"""
-Based on the following text{' and additional context' if additional_info else ''} from the file {file_name}, please extract metadata information.
-If you can't determine a specific piece of information with high confidence, use "Unknown".
+# Read-only lookups go through SQLAlchemy Core on the table, skipping ORM instrumentation
+content_table = Content.__table__
+
+# Columns returned by the content metadata endpoint, resolved once from the table
+# definition; custom_prompt is never needed there
+CONTENT_METADATA_COLUMNS = tuple(
+    column for column in content_table.columns if column.name != 'custom_prompt'
+)
+
+@lru_cache(maxsize=CONTENT_CACHE_SIZE)
+def _load_content_metadata(content_id, ttl_bucket):
+    row = db.session.execute(
+        select(*CONTENT_METADATA_COLUMNS).where(content_table.c.id == content_id)
+    ).mappings().first()
+    if not row:
+        return None
+
+    metadata = dict(row)
+    # Hash the values rather than (id, upload_date): batch extraction updates rows in place
+    etag = hashlib.blake2b(orjson.dumps(metadata, option=ORJSON_OPTIONS), digest_size=16).hexdigest()
+    return metadata, etag
+
+def get_content_metadata(content_id):
+    """Return (metadata dict, ETag) for a content row, or None if it doesn't exist"""
+    return _load_content_metadata(content_id, int(time.monotonic() // CONTENT_CACHE_TTL))
+
+def matching_etag(etag):
+    """The If-None-Match tag that covers etag, or None.
 
-{context}\n\nText to analyze:
-{text[:3000]}  # Using first 3000 characters
+    flask-compress appends the content encoding to the ETag of compressed responses
+    (e.g. "abc:gzip"), so the matched tag is returned as sent, to be echoed in a 304.
+    """
+    if request.if_none_match.star_tag:
+        return etag
+    for tag in request.if_none_match.as_set(include_weak=True):
+        if tag.split(':', 1)[0] == etag:
+            return tag
+    return None
+
+def invalidate_content_metadata():
+    """Drop cached content metadata after this service writes to the content table"""
+    _load_content_metadata.cache_clear()
+
+METADATA_FIELDS = (
+    'title', 'author', 'publication_date', 'publisher', 'source_language', 'genre', 'topic'
+)
+
+METADATA_SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": "string"} for field in METADATA_FIELDS},
+    "required": list(METADATA_FIELDS),
+    "additionalProperties": False
+}
+
+METADATA_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "Metadata", "strict": True, "schema": METADATA_SCHEMA}
+}
+
+BATCH_METADATA_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "MetadataBatch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"documents": {"type": "array", "items": METADATA_SCHEMA}},
+            "required": ["documents"],
+            "additionalProperties": False
+        }
+    }
+}
+
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a metadata extraction specialist."}
+
+# Prompts keep their static instructions first and the per-document values last, so the
+# prefix is byte-identical across requests and can hit OpenAI's prompt cache
+METADATA_PROMPT_TEMPLATE = string.Template("""
+Please extract metadata information from the text below.
+If you can't determine a specific piece of information with high confidence, use "Unknown".
 
 Please respond in JSON format with the following structure:
-{{
+{
     "title": "Document title",
     "author": "Author name(s)",
     "publication_date": "YYYY-MM-DD or Unknown",
@@ -86,37 +405,274 @@ Please respond in JSON format with the following structure:
     "source_language": "Primary language of the text",
     "genre": "Document genre/category",
     "topic": "Briefly describe the main topic of the document"
-}}
+}
+
+Be as specific as possible while maintaining accuracy. For publication_date, 
+if only year or year-month is known, use YYYY-01-01 or YYYY-MM-01 format.
+
+File name: $file_name
+${context}Text to analyze:
+$text
+""")
 
+BATCH_METADATA_PROMPT_TEMPLATE = string.Template("""
+Extract metadata information for each of the documents below.
+Return a JSON object whose "documents" array has exactly one entry per document, in the same order.
+If you can't determine a specific piece of information with high confidence, use "Unknown".
+
+For each document provide title, author, publication_date (YYYY-MM-DD or Unknown), publisher,
+source_language, genre and topic (a brief description of the main topic).
 Be as specific as possible while maintaining accuracy. For publication_date, 
 if only year or year-month is known, use YYYY-01-01 or YYYY-MM-01 format.
-"""
 
+Number of documents: $count
+
+$documents
+""")
+
+def build_metadata_messages(text, file_name, additional_info=None):
+    """Build the chat messages for a metadata extraction request"""
+    prompt = METADATA_PROMPT_TEMPLATE.substitute(
+        file_name=file_name,
+        context=f"Additional context: {additional_info}\n\n" if additional_info else "",
+        text=truncate_text(text)
+    )
+    return [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+
+class JsonObjectScanner:
+    """Accumulates streamed text until the top-level JSON object closes"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk):
+        """Add a chunk of text, returning True once the object is complete"""
+        for index, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '{':
+                self.depth += 1
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.buffer += chunk[:index + 1].encode()
+                    return True
+
+        self.buffer += chunk.encode()
+        return False
+
+async def read_json_stream(stream):
+    """Parse a streamed JSON completion, closing the stream as soon as the object is complete"""
+    scanner = JsonObjectScanner()
+    try:
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if scanner.feed(chunk.choices[0].delta.content):
+                    break
+    finally:
+        await stream.close()
+
+    return orjson.loads(scanner.buffer)
+
+def unknown_metadata():
+    return {field: "Unknown" for field in METADATA_FIELDS}
+
+async def extract_metadata_from_text(text, file_name, additional_info=None):
+    """Extract metadata using OpenAI API"""
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a metadata extraction specialist."},
-                {"role": "user", "content": prompt}
-            ]
+        messages = build_metadata_messages(text, file_name, additional_info)
+        cache_key = metadata_cache_key(messages)
+        metadata = await get_cached_metadata(cache_key)
+        if metadata is not None:
+            return metadata
+
+        stream = await create_chat_completion(
+            messages,
+            response_format=METADATA_RESPONSE_FORMAT,
+            stream=True
         )
-        
-        response_text = response.choices[0].message.content
-        response_text = response_text.replace("```json", "").replace("```", "")
-        metadata = json.loads(response_text)
-        return metadata
+        metadata = await read_json_stream(stream)
         
     except Exception as e:
         logging.error(f"Error extracting metadata: {str(e)}")
-        return {
-            "title": "Unknown",
-            "author": "Unknown",
-            "publication_date": "Unknown",
-            "publisher": "Unknown",
-            "source_language": "Unknown",
-            "genre": "Unknown",
-            "topic": "Unknown"
-        }
+        return unknown_metadata()
+
+    await set_cached_metadata(cache_key, metadata)
+    return metadata
+
+def build_batch_metadata_messages(items):
+    """Build one set of chat messages covering several documents"""
+    documents = []
+    for index, item in enumerate(items, start=1):
+        context = f"Additional context: {item['additional_info']}\n" if item.get('additional_info') else ""
+        documents.append(
+            f"[DOC {index}] from the file {item.get('file_name')}:\n{context}{truncate_text(item['text'])}"
+        )
+
+    prompt = BATCH_METADATA_PROMPT_TEMPLATE.substitute(
+        count=len(items),
+        documents="\n\n".join(documents)
+    )
+    return [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+
+async def extract_metadata_batch(items, semaphore):
+    """Extract metadata for up to BATCH_DOCUMENTS_PER_PROMPT items with a single OpenAI call.
+
+    Falls back to one call per item if the combined response can't be used. Every
+    OpenAI call, including the fallbacks, holds a slot of semaphore.
+    """
+    cache_keys = [
+        metadata_cache_key(build_metadata_messages(
+            item['text'], item.get('file_name'), item.get('additional_info')
+        ))
+        for item in items
+    ]
+    results = [await get_cached_metadata(key) for key in cache_keys]
+    misses = [index for index, metadata in enumerate(results) if metadata is None]
+    if not misses:
+        return results
+
+    try:
+        async with semaphore:
+            response = await create_chat_completion(
+                build_batch_metadata_messages([items[index] for index in misses]),
+                response_format=BATCH_METADATA_RESPONSE_FORMAT
+            )
+        documents = orjson.loads(response.choices[0].message.content)['documents']
+        if len(documents) != len(misses):
+            raise ValueError(f"expected {len(misses)} documents, got {len(documents)}")
+
+    except Exception as e:
+        logging.warning(f"Batched extraction failed, falling back to per-document calls: {str(e)}")
+
+        async def _extract(item):
+            async with semaphore:
+                return await extract_metadata_from_text(
+                    item['text'], item.get('file_name'), item.get('additional_info')
+                )
+
+        documents = await asyncio.gather(*[_extract(items[index]) for index in misses])
+        for index, metadata in zip(misses, documents):
+            results[index] = metadata
+        return results
+
+    for index, metadata in zip(misses, documents):
+        results[index] = metadata
+        await set_cached_metadata(cache_keys[index], metadata)
+    return results
+
+async def extract_metadata_concurrently(items, max_concurrency=BATCH_MAX_CONCURRENCY):
+    """Extract metadata for many items at once, returning results in input order.
+
+    At most max_concurrency OpenAI calls are in flight at any time.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    groups = [
+        items[start:start + BATCH_DOCUMENTS_PER_PROMPT]
+        for start in range(0, len(items), BATCH_DOCUMENTS_PER_PROMPT)
+    ]
+    results = await asyncio.gather(*[extract_metadata_batch(group, semaphore) for group in groups])
+    return [metadata for group_results in results for metadata in group_results]
+
+async def submit_metadata_batch(items):
+    """Submit items to the OpenAI Batch API, using each item's content_id as its custom_id"""
+    lines = [
+        orjson.dumps({
+            'custom_id': str(item['content_id']),
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': {
+                'model': OPENAI_MODEL,
+                'messages': build_metadata_messages(
+                    item['text'], item.get('file_name'), item.get('additional_info')
+                ),
+                'response_format': METADATA_RESPONSE_FORMAT
+            }
+        })
+        for item in items
+    ]
+
+    batch_file = await _client().files.create(
+        file=('metadata_batch.jsonl', b'\n'.join(lines)),
+        purpose='batch'
+    )
+    return await _client().batches.create(
+        input_file_id=batch_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+
+async def fetch_metadata_batch(batch_id):
+    """Return the batch and, once it has reached a terminal status, its extracted metadata
+    keyed by content ID. Expired and cancelled batches still yield the requests that finished.
+    """
+    batch = await _client().batches.retrieve(batch_id)
+    if batch.status in BATCH_PENDING_STATUSES:
+        return batch, None
+
+    if batch.status == 'failed' and batch.errors:
+        logging.warning(f"Batch {batch_id} failed: {batch.errors}")
+
+    # Requests that failed outright are only reported in the error file
+    if batch.error_file_id:
+        errors = await _client().files.content(batch.error_file_id)
+        for line in errors.content.splitlines():
+            if line:
+                record = orjson.loads(line)
+                logging.warning(f"Batch {batch_id} request {record.get('custom_id')} failed: "
+                                f"{record.get('error') or record.get('response')}")
+
+    results = {}
+    if not batch.output_file_id:
+        return batch, results
+
+    output = await _client().files.content(batch.output_file_id)
+    for line in output.content.splitlines():
+        if not line:
+            continue
+        record = orjson.loads(line)
+        response = record.get('response') or {}
+        if response.get('status_code') != 200:
+            logging.warning(f"Batch {batch_id} request {record.get('custom_id')} failed: {record.get('error')}")
+            continue
+        try:
+            results[int(record['custom_id'])] = orjson.loads(
+                response['body']['choices'][0]['message']['content']
+            )
+        except Exception as e:
+            logging.error(f"Error parsing batch {batch_id} result {record.get('custom_id')}: {str(e)}")
+
+    return batch, results
+
+def apply_metadata(content, metadata):
+    """Copy extracted metadata onto a Content row, leaving Unknown fields untouched.
+
+    String values are cut to their column's length so MySQL strict mode can't reject the row.
+    """
+    for field in METADATA_FIELDS:
+        value = metadata.get(field)
+        if not isinstance(value, str) or value in ("", "Unknown"):
+            continue
+        if field == 'publication_date':
+            try:
+                value = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                continue
+        else:
+            length = getattr(content_table.c[field].type, 'length', None)
+            if length:
+                value = value[:length]
+        setattr(content, field, value)
 
 # API Models
 metadata_request = api.model('MetadataRequest', {
@@ -130,6 +686,31 @@ metadata_response = api.model('MetadataResponse', {
     'metadata': fields.Raw(description='Extracted metadata')
 })
 
+batch_metadata_request = api.model('BatchMetadataRequest', {
+    'items': fields.List(fields.Nested(metadata_request), required=True, description='Texts to extract metadata from'),
+    'max_concurrency': fields.Integer(description=f'Maximum concurrent OpenAI calls (default {BATCH_MAX_CONCURRENCY})')
+})
+
+batch_metadata_response = api.model('BatchMetadataResponse', {
+    'message': fields.String(description='Status message'),
+    'results': fields.List(fields.Raw, description='Extracted metadata, in request order')
+})
+
+batch_submit_item = api.inherit('BatchSubmitItem', metadata_request, {
+    'content_id': fields.Integer(required=True, description='Content ID the results are written back to')
+})
+
+batch_submit_request = api.model('BatchSubmitRequest', {
+    'items': fields.List(fields.Nested(batch_submit_item), required=True, description='Content to extract metadata for')
+})
+
+batch_status_response = api.model('BatchStatusResponse', {
+    'message': fields.String(description='Status message'),
+    'batch_id': fields.String(description='OpenAI batch ID'),
+    'status': fields.String(description='OpenAI batch status'),
+    'updated_content_ids': fields.List(fields.Integer, description='Content IDs whose metadata was saved')
+})
+
 content_metadata_response = api.model('ContentMetadataResponse', {
     'message': fields.String(description='Status message'),
     'metadata': fields.Raw(description='Content metadata')
@@ -150,7 +731,7 @@ class MetadataExtractResource(Resource):
             file_name = request.json.get('file_name')
             additional_info = request.json.get('additional_info')
             
-            metadata = extract_metadata_from_text(text, file_name, additional_info)
+            metadata = run_async(extract_metadata_from_text(text, file_name, additional_info))
             
             return {
                 'message': 'Metadata extracted successfully',
@@ -161,64 +742,169 @@ class MetadataExtractResource(Resource):
             logging.error(f"Error in get_metadata: {str(e)}")
             api.abort(500, 'Internal server error')
 
+@ns.route('/metadata/extract/batch')
+class MetadataExtractBatchResource(Resource):
+    @api.doc('extract_metadata_batch')
+    @api.expect(batch_metadata_request)
+    @api.marshal_with(batch_metadata_response)
+    def post(self):
+        """Extract metadata from many texts concurrently"""
+        if not isinstance(request.json, dict):
+            api.abort(400, 'Request body must be a JSON object')
+        items = request.json.get('items')
+        if not items or not isinstance(items, list):
+            api.abort(400, 'No items provided')
+        if len(items) > BATCH_MAX_ITEMS:
+            api.abort(400, f'At most {BATCH_MAX_ITEMS} items per batch')
+        if any(not isinstance(item, dict) or not isinstance(item.get('text'), str) for item in items):
+            api.abort(400, 'Every item needs text')
+
+        max_concurrency = request.json.get('max_concurrency') or BATCH_MAX_CONCURRENCY
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            api.abort(400, 'max_concurrency must be a positive integer')
+
+        try:
+            results = run_async(extract_metadata_concurrently(items, max_concurrency))
+
+            return {
+                'message': 'Metadata extracted successfully',
+                'results': results
+            }, 200
+
+        except Exception as e:
+            logging.error(f"Error in extract_metadata_batch: {str(e)}")
+            api.abort(500, 'Internal server error')
+
+@ns.route('/metadata/extract/batch/submit')
+class MetadataBatchSubmitResource(Resource):
+    @api.doc('submit_metadata_batch')
+    @api.expect(batch_submit_request)
+    @api.marshal_with(batch_status_response)
+    def post(self):
+        """Queue metadata extraction for content through the OpenAI Batch API"""
+        if not isinstance(request.json, dict):
+            api.abort(400, 'Request body must be a JSON object')
+        items = request.json.get('items')
+        if not items or not isinstance(items, list):
+            api.abort(400, 'No items provided')
+        if any(not isinstance(item, dict) or not isinstance(item.get('text'), str)
+               or not isinstance(item.get('content_id'), int) for item in items):
+            api.abort(400, 'Every item needs text and an integer content_id')
+        # content_id becomes the batch request's custom_id, which OpenAI requires to be unique
+        if len({item['content_id'] for item in items}) != len(items):
+            api.abort(400, 'Duplicate content_id in items')
+
+        try:
+            batch = run_async(submit_metadata_batch(items))
+
+            return {
+                'message': 'Batch submitted successfully',
+                'batch_id': batch.id,
+                'status': batch.status
+            }, 202
+
+        except Exception as e:
+            logging.error(f"Error in submit_metadata_batch: {str(e)}")
+            api.abort(500, 'Internal server error')
+
+@ns.route('/metadata/extract/batch/<string:batch_id>')
+class MetadataBatchStatusResource(Resource):
+    @api.doc('get_metadata_batch')
+    @api.marshal_with(batch_status_response)
+    def get(self, batch_id):
+        """Poll an OpenAI batch and save its results to the content rows once complete"""
+        try:
+            batch, results = run_async(fetch_metadata_batch(batch_id))
+        except NotFoundError:
+            api.abort(404, 'Batch not found')
+        except Exception as e:
+            logging.error(f"Error in get_metadata_batch: {str(e)}")
+            api.abort(500, 'Internal server error')
+
+        if results is None:
+            return {
+                'message': 'Batch not complete',
+                'batch_id': batch.id,
+                'status': batch.status,
+                'updated_content_ids': []
+            }, 200
+
+        try:
+            updated_content_ids = []
+            for content_id, metadata in results.items():
+                content = db.session.get(Content, content_id)
+                if content:
+                    apply_metadata(content, metadata)
+                    updated_content_ids.append(content_id)
+            db.session.commit()
+            invalidate_content_metadata()
+
+            return {
+                'message': 'Batch results saved successfully' if results
+                           else f'Batch {batch.status} without any successful results',
+                'batch_id': batch.id,
+                'status': batch.status,
+                'updated_content_ids': updated_content_ids
+            }, 200
+
+        except Exception as e:
+            db.session.rollback()
+            logging.error(f"Error in get_metadata_batch: {str(e)}")
+            api.abort(500, 'Internal server error')
+
 @ns.route('/content/<int:content_id>/metadata')
 class ContentMetadataResource(Resource):
     @api.doc('get_content_metadata')
-    @api.marshal_with(content_metadata_response)
+    @api.response(200, 'Metadata retrieved successfully', content_metadata_response)
+    @api.response(304, 'Metadata not modified')
+    @api.response(404, 'Content not found')
     def get(self, content_id):
         """Get metadata for specific content ID"""
         try:
-            content = Content.query.get(content_id)
-            
-            if not content:
-                api.abort(404, 'Content not found')
-                
-            metadata = {
-                'id': content.id,
-                'user_id': content.user_id,
-                'file_name': content.file_name,
-                'file_type': content.file_type,
-                'upload_date': content.upload_date.isoformat(),
-                'file_size': content.file_size,
-                's3_key': content.s3_key,
-                'chunk_count': content.chunk_count,
-                'title': content.title,
-                'author': content.author,
-                'publication_date': content.publication_date.isoformat() if content.publication_date else None,
-                'publisher': content.publisher,
-                'source_language': content.source_language,
-                'genre': content.genre,
-                'topic': content.topic
-            }
-            
-            return {
-                'message': 'Metadata retrieved successfully',
-                'metadata': metadata
-            }, 200
+            cached = get_content_metadata(content_id)
             
         except Exception as e:
             logging.error(f"Error in get_content_metadata: {str(e)}")
             api.abort(500, 'Internal server error')
 
+        if not cached:
+            api.abort(404, 'Content not found')
+
+        metadata, etag = cached
+        matched_etag = matching_etag(etag)
+        if matched_etag:
+            response = app.response_class(status=304)
+            response.set_etag(matched_etag, weak=request.if_none_match.is_weak(matched_etag))
+        else:
+            response = output_json({
+                'message': 'Metadata retrieved successfully',
+                'metadata': metadata
+            }, 200)
+            response.set_etag(etag)
+
+        response.cache_control.private = True
+        response.cache_control.max_age = CONTENT_CACHE_MAX_AGE
+        return response
+
 @app.before_request
 def log_request_info():
     # Exempt the /docs endpoint from logging and API key checks
     if request.path.startswith('/docs') or request.path.startswith('/swagger'):
         return
 
-    logging.info(f"Headers: {request.headers}")
-    logging.info(f"Body: {request.get_data()}")
+    # Bodies are never read here; a sample of requests is logged by size only
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Headers: {request.headers}")
+    if random.random() < REQUEST_LOG_SAMPLE_RATE:
+        logging.info(f"{request.method} {request.path} content-length={request.content_length}")
 
     if 'X-API-KEY' not in request.headers:
         logging.warning("No X-API-KEY header")
         return jsonify({'error': 'No X-API-KEY'}), 401
     
     x_api_key = request.headers.get('X-API-KEY')
-    if x_api_key != API_KEY:
+    if x_api_key != _secrets().get('API_KEY'):
         logging.warning("Invalid X-API-KEY")
         return jsonify({'error': 'Invalid X-API-KEY'}), 401
     else:
         return
-
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=C_PORT)
\ No newline at end of file
@@ -1,7 +1,10 @@
+import os
 import requests
 import logging
-from pprint import pprint
+from concurrent.futures import ThreadPoolExecutor
+from pprint import pformat
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 
 # Configure logging
 logging.basicConfig(
@@ -13,6 +16,16 @@ logging.basicConfig(
 # Configuration
 # METADATA_SERVICE_URL = 'http://3.85.142.23:80'
 METADATA_SERVICE_URL = "http://localhost:5000"
+API_KEY = os.environ.get('METADATA_API_KEY')
+MAX_WORKERS = 8
+
+# Shared session so test requests reuse keep-alive connections
+session = requests.Session()
+if API_KEY:
+    session.headers.update({'X-API-KEY': API_KEY})
+session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 def test_metadata_extraction():
     """Test metadata extraction with various text samples"""
     
@@ -56,63 +69,69 @@ def test_metadata_extraction():
         }
     ]
     
-    for test_case in test_cases:
-        logging.info(f"\nTesting metadata extraction for: {test_case['name']}")
-        logging.info("-" * 50)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(run_extraction_case, test_cases))
+
+def run_extraction_case(test_case):
+    """Run a single metadata extraction test case"""
+    logging.info(f"\nTesting metadata extraction for: {test_case['name']}")
+    logging.info("-" * 50)
+    
+    try:
+        # Make the extraction request
+        response = session.post(
+            f"{METADATA_SERVICE_URL}/api/metadata/extract",
+            json={
+                'text': test_case['text'],
+                'additional_info': test_case.get('additional_info')
+            }
+        )
         
-        try:
-            # Make the extraction request
-            response = requests.post(
-                f"{METADATA_SERVICE_URL}/api/metadata/extract",
-                json={
-                    'text': test_case['text'],
-                    'additional_info': test_case.get('additional_info')
-                }
-            )
+        if response.status_code == 200:
+            result = response.json()
+            logging.info(f"Extracted Metadata ({test_case['name']}):\n{pformat(result['metadata'])}")
+            
+            # Validate metadata fields
+            metadata = result['metadata']
+            validate_metadata(metadata)
             
-            if response.status_code == 200:
-                result = response.json()
-                logging.info("Extracted Metadata:")
-                pprint(result['metadata'])
-                
-                # Validate metadata fields
-                metadata = result['metadata']
-                validate_metadata(metadata)
-                
-            else:
-                logging.error(f"Extraction failed with status code: {response.status_code}")
-                logging.error(f"Error message: {response.json()}")
-                
-        except Exception as e:
-            logging.error(f"Test failed with error: {str(e)}")
+        else:
+            logging.error(f"Extraction failed with status code: {response.status_code}")
+            logging.error(f"Error message: {response.json()}")
+            
+    except Exception as e:
+        logging.error(f"Test failed with error: {str(e)}")
 
 def test_content_metadata_retrieval():
     """Test retrieving metadata for specific content IDs"""
     
     test_content_ids = [1, 2, 3]  # Replace with actual content IDs from your database
     
-    for content_id in test_content_ids:
-        logging.info(f"\nTesting metadata retrieval for content ID: {content_id}")
-        logging.info("-" * 50)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(run_retrieval_case, test_content_ids))
+
+def run_retrieval_case(content_id):
+    """Retrieve and log the metadata for a single content ID"""
+    logging.info(f"\nTesting metadata retrieval for content ID: {content_id}")
+    logging.info("-" * 50)
+    
+    try:
+        response = session.get(
+            f"{METADATA_SERVICE_URL}/api/content/{content_id}/metadata"
+        )
         
-        try:
-            response = requests.get(
-                f"{METADATA_SERVICE_URL}/api/content/{content_id}/metadata"
-            )
+        if response.status_code == 200:
+            result = response.json()
+            logging.info(f"Retrieved Metadata ({content_id}):\n{pformat(result['metadata'])}")
+            
+        elif response.status_code == 404:
+            logging.warning(f"Content ID {content_id} not found")
+        else:
+            logging.error(f"Retrieval failed with status code: {response.status_code}")
+            logging.error(f"Error message: {response.json()}")
             
-            if response.status_code == 200:
-                result = response.json()
-                logging.info("Retrieved Metadata:")
-                pprint(result['metadata'])
-                
-            elif response.status_code == 404:
-                logging.warning(f"Content ID {content_id} not found")
-            else:
-                logging.error(f"Retrieval failed with status code: {response.status_code}")
-                logging.error(f"Error message: {response.json()}")
-                
-        except Exception as e:
-            logging.error(f"Test failed with error: {str(e)}")
+    except Exception as e:
+        logging.error(f"Test failed with error: {str(e)}")
 
 def validate_metadata(metadata):
     """Validate metadata fields"""